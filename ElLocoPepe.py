@@ -1,13 +1,20 @@
 # app.py — Crazy Joe (Memory-Only)
-import math, random, time, threading
+import time
+from collections import deque
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+try:
+    from fastrlock.rlock import FastRLock as _Lock  # C-level lock, faster uncontended acquire
+except ImportError:
+    from threading import RLock as _Lock
+
 # ---------------------------
 # Custom CSS for Better Mobile Experience
 # ---------------------------
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Mobile-friendly improvements */
     .stForm {
@@ -81,7 +88,9 @@ st.markdown("""
         box-shadow: 0 4px 12px rgba(40, 167, 69, 0.3) !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+# Fragment ticks skip this; every full rerun must re-emit it or the styles are dropped
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # ---------------------------
 # Config (tweak as you like)
@@ -96,230 +105,393 @@ st.set_page_config(page_title="TMR Alliance - EL Loco Pepe!", page_icon="🧊",
 # ---------------------------
 # Shared in-memory store
 # ---------------------------
+MEMBER_ARRAYS = ("power", "slots", "x", "y", "updated_at")
+
 class Store:
     def __init__(self):
-        self.lock = threading.Lock()
-        # Members: name -> dict(power, slots_to_send, online, updated_at)
-        self.members = {}
+        # One lock per state domain so readers of one never wait on
+        # writers of another. Nested acquires go members -> assignments -> config.
+        self.members_lock = _Lock()
+        self.assignments_lock = _Lock()
+        self.config_lock = _Lock()
+        # Members, column-oriented: row i of every column is one member and
+        # idx maps name -> row. Arrays grow by doubling, so only the first
+        # len(names) rows are live.
+        self.names = []
+        self.idx = {}
+        self.coord_str = []         # "(x,y)" display strings
+        self.power = np.zeros(0, dtype=np.int64)
+        self.slots = np.zeros(0, dtype=np.int32)
+        self.x = np.zeros(0, dtype=np.int16)
+        self.y = np.zeros(0, dtype=np.int16)
+        self.updated_at = np.zeros(0, dtype=np.float64)  # epoch secs
+        # Online status: roster-wide default plus the names that differ from it,
+        # so the usual everyone-online case needs no per-row flag at all
+        self.all_online = True
+        self.online_overrides = set()
         # Assignments: sender -> [targets]; batch_id marks last saved set
         self.assignments = {}
+        # Reverse index of assignments: target -> {senders}
+        self.target_to_senders = {}
         self.batch_id = None
         self.locked = False
         # Assignment mode: "balanced" or "power_based"
         self.assignment_mode = "balanced"
+        # Bumped by member, assignment, mode and reset writes (guarded by config_lock); keys the cached frames
+        self.version = 0
+        # Bumped only on member writes (guarded by members_lock); keys and seeds the assignment draw
+        self.roster_version = 0
+        # Bumped on each saved batch (guarded by config_lock) so the next Recalculate draws afresh
+        self.draw_count = 0
 
 @st.cache_resource(show_spinner=False)
 def get_store() -> Store:
     return Store()
 
+@st.cache_resource(show_spinner=False)
+def get_cache() -> dict:
+    # Memoized assignment results shared by all sessions: key -> (version key, value)
+    return {}
+
 store = get_store()
+cache = get_cache()
 
 # ---------------------------
 # Helpers
 # ---------------------------
+def bump_version():
+    # Only the cached frame builders key on this, so writes neither frame shows (the lock toggle) skip it
+    with store.config_lock:
+        store.version += 1
+
+def bump_roster_version():
+    """Mark a member write. Caller holds members_lock."""
+    store.roster_version += 1
+    bump_version()
+
+POWER_MAX = int(np.iinfo(np.int64).max)
+
 def parse_power(power_input):
     """Parse power input - automatically treats all input as millions (e.g., '125' -> 125000000)"""
-    if isinstance(power_input, (int, float)):
-        return int(power_input * 1_000_000)
-    
-    power_str = str(power_input).strip().upper()
-    if power_str.endswith('M'):
-        # Remove 'M' and multiply by 1,000,000
-        base_value = float(power_str[:-1])
-        return int(base_value * 1_000_000)
+    if not isinstance(power_input, str):
+        value = power_input * 1_000_000
     else:
-        # Treat as millions automatically
-        base_value = float(power_str)
-        return int(base_value * 1_000_000)
+        power_str = power_input.strip()
+        if power_str and power_str[-1] in ('M', 'm'):
+            # Drop the 'M' suffix without building an uppercased copy
+            power_str = power_str[:-1]
+        power_str = power_str.replace('_', '')
+        # Treat as millions automatically; whole numbers skip float parsing
+        if power_str.isdigit():
+            value = int(power_str) * 1_000_000
+        else:
+            value = float(power_str) * 1_000_000
+    # The power column is int64; anything past it (or inf/nan) can't be stored
+    if not 0 <= value <= POWER_MAX:
+        raise ValueError("Power value is out of range")
+    return int(value)
+
+def _reserve_rows(n: int):
+    """Grow the member arrays (doubling) so they hold at least n rows. Caller holds members_lock."""
+    cap = len(store.power)
+    if n <= cap:
+        return
+    new_cap = max(16, cap * 2, n)
+    for col in MEMBER_ARRAYS:
+        old = getattr(store, col)
+        new = np.zeros(new_cap, dtype=old.dtype)
+        new[:cap] = old
+        setattr(store, col, new)
+
+def _online_mask():
+    """Online flag per live row, or None when everyone is online. Caller holds members_lock."""
+    if store.all_online and not store.online_overrides:
+        return None
+    overrides, default = store.online_overrides, store.all_online
+    return np.fromiter(((n in overrides) != default for n in store.names),
+                       dtype=bool, count=len(store.names))
 
 def upsert_member(name: str, power, slots: int, online: bool, x_coord: int = 0, y_coord: int = 0):
-    now = datetime.utcnow().isoformat()
-    with store.lock:
-        rec = store.members.get(name.strip(), {})
-        rec.update({
-            "power": parse_power(power),
-            "slots_to_send": int(slots),
-            "online": bool(online),
-            "x_coord": int(x_coord),
-            "y_coord": int(y_coord),
-            "updated_at": now,
-        })
-        store.members[name.strip()] = rec
+    key = name.strip()
+    try:
+        # Cast to the column dtypes up front so a bad value raises before any state changes
+        row = (np.int64(parse_power(power)), np.int32(int(slots)),
+               np.int16(int(x_coord)), np.int16(int(y_coord)))
+    except OverflowError as e:
+        raise ValueError(str(e)) from None
+    online = bool(online)
+    coord_str = f"({row[2]},{row[3]})"
+    with store.members_lock:
+        i = store.idx.get(key)
+        if i is None:
+            i = len(store.names)
+            _reserve_rows(i + 1)
+            store.names.append(key)
+            store.coord_str.append(coord_str)
+            store.idx[key] = i
+        elif (tuple(getattr(store, col)[i] for col in MEMBER_ARRAYS[:4]) == row
+              and ((key in store.online_overrides) != store.all_online) == online):
+            # Re-submitting an unchanged form must not invalidate every viewer's cache
+            return
+        for col, value in zip(MEMBER_ARRAYS, row):
+            getattr(store, col)[i] = value
+        if online == store.all_online:
+            store.online_overrides.discard(key)
+        else:
+            store.online_overrides.add(key)
+        store.coord_str[i] = coord_str
+        store.updated_at[i] = time.time()
+        bump_roster_version()
 
 def set_all_online(status: bool):
-    with store.lock:
-        for n, rec in store.members.items():
-            rec["online"] = bool(status)
-            rec["updated_at"] = datetime.utcnow().isoformat()
-
-def members_df() -> pd.DataFrame:
-    with store.lock:
-        if not store.members:
-            return pd.DataFrame(columns=["name","power","slots_to_send","online","x_coord","y_coord","updated_at"])
-        rows = [{"name": n, **rec} for n, rec in store.members.items()]
-    df = pd.DataFrame(rows)
-    
-    # Ensure all required columns exist, add defaults for missing ones
-    required_cols = ["name","power","slots_to_send","online","x_coord","y_coord","updated_at"]
-    for col in required_cols:
-        if col not in df.columns:
-            if col in ["x_coord", "y_coord"]:
-                df[col] = 0
-            else:
-                df[col] = ""
-    
-    df = df[required_cols].sort_values("power", ascending=False)
+    now = time.time()
+    status = bool(status)
+    with store.members_lock:
+        n = len(store.names)
+        mask = _online_mask()
+        changed = (np.ones(n, dtype=bool) if mask is None else mask) != status
+        store.all_online = status
+        store.online_overrides.clear()
+        if changed.any():
+            store.updated_at[:n][changed] = now
+            bump_roster_version()
+
+def members_df(sort: bool = True) -> pd.DataFrame:
+    """Roster frame, strongest first unless sort=False (st.dataframe sorts on its own)."""
+    return _members_df_cached(store.version, sort)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _members_df_cached(version: int, sort: bool) -> pd.DataFrame:
+    # Copy the live rows of each column under the lock, build outside it
+    with store.members_lock:
+        n = len(store.names)
+        names = np.array(store.names, dtype=object)
+        cols = {col: getattr(store, col)[:n].copy() for col in MEMBER_ARRAYS}
+    if not n:
+        return pd.DataFrame(columns=["name","power","slots_to_send","x_coord","y_coord","updated_at"])
     
-    # Convert power to millions for display
-    df["power"] = (df["power"] / 1_000_000).round(1)
-    
-    return df.reset_index(drop=True)
-
-def compute_assignments(online_df: pd.DataFrame) -> dict:
+    # Strongest first; reorder every column by one argsort instead of a frame sort
+    order = np.argsort(-cols["power"], kind="stable") if sort else slice(None)
+    return pd.DataFrame({
+        "name": names[order],
+        # Power in millions and epoch timestamps as UTC strings for display
+        "power": (cols["power"][order] / 1_000_000).round(1),
+        "slots_to_send": cols["slots"][order],
+        "x_coord": cols["x"][order],
+        "y_coord": cols["y"][order],
+        "updated_at": pd.to_datetime(cols["updated_at"][order], unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+
+def _online_arrays() -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Snapshot online members as parallel (names, powers, slots) arrays plus the roster version they match."""
+    with store.members_lock:
+        version = store.roster_version
+        n = len(store.names)
+        names = np.array(store.names, dtype=object)
+        mask = _online_mask()
+        if mask is None:
+            return names, store.power[:n].copy(), store.slots[:n].copy(), version
+        # Boolean indexing copies, so the arrays stay valid after the lock is released
+        return names[mask], store.power[:n][mask], store.slots[:n][mask], version
+
+def online_members(df: pd.DataFrame) -> pd.DataFrame:
+    """Online rows of a members_df() frame; the frame itself when everyone is online."""
+    with store.members_lock:
+        mask = _online_mask()
+        if mask is None:
+            return df
+        online = set(np.array(store.names, dtype=object)[mask].tolist())
+    return df[df["name"].isin(online)].reset_index(drop=True)
+
+def compute_assignments(names: np.ndarray, powers: np.ndarray, slots: np.ndarray, version: int) -> dict:
     """
     Returns dict: sender -> [targets]
+    Takes the parallel arrays and roster version from _online_arrays().
     Two modes available:
     - "balanced": Equal distribution for maximum alliance benefit
     - "power_based": Nearest power matching for optimal Crazy Joe scoring
     """
-    if online_df.empty:
+    n = len(names)
+    if n == 0:
         return {}
+    # Nobody to reinforce (lone member) or nothing to send: skip the lock, cache and shuffles
+    if n == 1 or not slots.any():
+        return {s: [] for s in names.tolist()}
 
-    with store.lock:
+    with store.config_lock:
         mode = getattr(store, 'assignment_mode', 'balanced')
+        draw = store.draw_count
+    key = (version, draw, mode)
+
+    hit = cache.get("assignments")
+    if hit and hit[0] == key:
+        return hit[1]
 
+    # Seeded by roster version and draw: every viewer sees the same preview, unrelated writes
+    # don't reshuffle it, and each saved batch moves the next Recalculate to a new draw
+    rng = np.random.default_rng((version, draw))
     if mode == "balanced":
-        return compute_balanced_assignments(online_df)
+        result = compute_balanced_assignments(names, powers, slots, rng)
     else:
-        return compute_power_based_assignments(online_df)
+        result = compute_power_based_assignments(names, powers, slots, rng)
+    cache["assignments"] = (key, result)
+    return result
 
-def compute_balanced_assignments(online_df: pd.DataFrame) -> dict:
+def compute_balanced_assignments(names: np.ndarray, powers: np.ndarray, slots: np.ndarray,
+                                 rng=None) -> dict:
     """Balanced distribution: ensures each target gets reinforced by only one sender."""
-    senders = online_df.copy()
-    targets = online_df.copy()
-
-    # Each target can only be reinforced by one sender
-    available_targets = set(targets["name"].tolist())
-    result = {s: [] for s in senders["name"].tolist()}
+    rng = rng or np.random.default_rng()
+    n = len(names)
+    picks = [[] for _ in range(n)]
     
-    # Create a list of all senders with their slot counts
-    sender_slots = []
-    for _, sender in senders.iterrows():
-        for _ in range(int(sender["slots_to_send"])):
-            sender_slots.append(sender["name"])
-    
-    random.shuffle(sender_slots)
+    # Expand every sender into one entry per slot (as row indices)
+    sender_slots = rng.permutation(np.repeat(np.arange(n), slots)).tolist()
     
     # Assign each sender to a unique target
-    target_list = list(available_targets)
-    random.shuffle(target_list)
+    target_list = rng.permutation(n).tolist()
     
-    target_index = 0
+    # Live targets rotate through a deque; a target leaves it once taken
+    live = deque(target_list)
     for sender in sender_slots:
-        if target_index < len(target_list):
-            target = target_list[target_index]
-            if target != sender:  # Don't reinforce yourself
-                result[sender].append(target)
-                target_index += 1
-            else:
-                # If target is the sender, find next available target
-                for i in range(len(target_list)):
-                    next_target = target_list[(target_index + i + 1) % len(target_list)]
-                    if next_target != sender:
-                        result[sender].append(next_target)
-                        target_index += 1
-                        break
-
-    return result
-
-def compute_power_based_assignments(online_df: pd.DataFrame) -> dict:
+        if not live:
+            break
+        target = live.popleft()
+        if target == sender:  # Don't reinforce yourself
+            if not live:
+                live.append(target)
+                continue
+            # Skip past yourself and leave your own slot for the next sender
+            target, skipped = live.popleft(), target
+            live.appendleft(skipped)
+        picks[sender].append(target)
+
+    name_list = names.tolist()
+    return {name: [name_list[t] for t in picks[i]] for i, name in enumerate(name_list)}
+
+def compute_power_based_assignments(names: np.ndarray, powers: np.ndarray, slots: np.ndarray,
+                                    rng=None) -> dict:
     """Power-based matching: each target gets reinforced by only one sender."""
-    senders = online_df.copy()
-    targets = online_df.copy()
-
-    # Each target can only be reinforced by one sender
-    available_targets = set(targets["name"].tolist())
-    result = {s: [] for s in senders["name"].tolist()}
+    rng = rng or np.random.default_rng()
+    n = len(names)
     
-    # Create a list of all senders with their slot counts
-    sender_slots = []
-    for _, sender in senders.iterrows():
-        for _ in range(int(sender["slots_to_send"])):
-            sender_slots.append(sender["name"])
+    # Sort by power once; a sender's nearest matches are its neighbours in
+    # that order, so each sender walks outward from its own position.
+    # Everything below works on positions in that order, not on names.
+    order = np.argsort(powers, kind="stable")
+    rank = np.empty(n, dtype=np.intp)
+    rank[order] = np.arange(n)
+    ranked_power = powers[order].tolist()
     
-    random.shuffle(sender_slots)
+    # Expand every sender into one entry per slot
+    sender_slots = rng.permutation(np.repeat(rank, slots)).tolist()
     
-    # For each sender, find their nearest power match that hasn't been assigned
-    for sender in sender_slots:
-        if not available_targets:
+    # Each target can only be reinforced by one sender
+    taken = [False] * n
+    available = n
+    lo = list(range(-1, n - 1))
+    hi = list(range(1, n + 1))
+    picks = [[] for _ in range(n)]
+    
+    # For each sender, take their nearest power match that hasn't been assigned
+    for s in sender_slots:
+        if not available:
             break
-            
-        # Find the closest power match for this sender
-        sender_power = senders.loc[senders["name"] == sender, "power"].iloc[0]
-        best_target = None
-        min_power_diff = float('inf')
         
-        for target in available_targets:
-            if target != sender:  # Don't reinforce yourself
-                target_power = targets.loc[targets["name"] == target, "power"].iloc[0]
-                power_diff = abs(sender_power - target_power)
-                if power_diff < min_power_diff:
-                    min_power_diff = power_diff
-                    best_target = target
+        down, up = lo[s], hi[s]
+        while down >= 0 and taken[down]:
+            down -= 1
+        while up < n and taken[up]:
+            up += 1
+        if down < 0 and up >= n:
+            lo[s], hi[s] = down, up
+            continue
         
-        if best_target:
-            result[sender].append(best_target)
-            available_targets.remove(best_target)
+        p = ranked_power[s]
+        if up >= n or (down >= 0 and p - ranked_power[down] <= ranked_power[up] - p):
+            t, down = down, down - 1
+        else:
+            t, up = up, up + 1
+        lo[s], hi[s] = down, up
+        taken[t] = True
+        available -= 1
+        picks[s].append(t)
 
-    return result
+    ranked = names[order].tolist()
+    return {name: [ranked[t] for t in picks[r]] for name, r in zip(names.tolist(), rank.tolist())}
 
 def save_assignments(assign_map: dict):
-    with store.lock:
-        store.assignments = {k:list(v) for k,v in assign_map.items()}
-        store.batch_id = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    assignments = {k:list(v) for k,v in assign_map.items()}
+    target_to_senders = {}
+    for sender, targets in assignments.items():
+        for t in targets:
+            target_to_senders.setdefault(t, set()).add(sender)
+    batch_id = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    with store.assignments_lock:
+        store.assignments = assignments
+        store.target_to_senders = target_to_senders
+        store.batch_id = batch_id
+        with store.config_lock:
+            store.draw_count += 1
+        bump_version()
 
 def assignments_df() -> pd.DataFrame:
-    with store.lock:
-        if not store.assignments:
-            return pd.DataFrame(columns=["sender","targets"])
-        
-        # Get member coordinates for display
-        member_coords = {}
-        for name, rec in store.members.items():
-            x = rec.get("x_coord", 0)
-            y = rec.get("y_coord", 0)
-            member_coords[name] = f"({x},{y})"
-        
-        rows = []
-        for s, tgts in store.assignments.items():
-            # Format targets with coordinates
-            target_list = []
-            for t in tgts:
-                coords = member_coords.get(t, "(0,0)")
-                target_list.append(f"{t} {coords}")
-            rows.append({"sender": s, "targets": ", ".join(target_list)})
-        
-        df = pd.DataFrame(rows).sort_values("sender").reset_index(drop=True)
-        return df
+    return _assignments_df_cached(store.version)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _assignments_df_cached(version: int) -> pd.DataFrame:
+    # One consistent snapshot of both dicts under the locks, format outside them
+    with store.members_lock, store.assignments_lock:
+        snap = {k: list(v) for k, v in store.assignments.items()}
+        member_coords = dict(zip(store.names, store.coord_str))
+    if not snap:
+        return pd.DataFrame(columns=["sender","targets"])
+    return format_assignments(snap, member_coords)
+
+def format_assignments(assign_map: dict, member_coords: dict) -> pd.DataFrame:
+    """Sender-sorted (sender, targets) table with each target's coordinates."""
+    items = sorted(assign_map.items())
+    return pd.DataFrame({
+        "sender": [s for s, _ in items],
+        "targets": [", ".join([f"{t} {member_coords.get(t, '(0,0)')}" for t in tgts]) for _, tgts in items],
+    })
 
 def remove_member(name: str):
-    with store.lock:
-        if name in store.members:
-            del store.members[name]
+    with store.members_lock, store.assignments_lock:
+        i = store.idx.pop(name, None)
+        if i is not None:
+            # Swap-remove: the last row moves into the hole
+            last = len(store.names) - 1
+            if i != last:
+                moved = store.names[last]
+                store.names[i] = moved
+                store.coord_str[i] = store.coord_str[last]
+                store.idx[moved] = i
+                for col in MEMBER_ARRAYS:
+                    arr = getattr(store, col)
+                    arr[i] = arr[last]
+            store.names.pop()
+            store.coord_str.pop()
+            store.online_overrides.discard(name)
             # Also remove from assignments if they were a sender
-            if name in store.assignments:
-                del store.assignments[name]
-            # Remove them from other people's target lists
-            for sender, targets in store.assignments.items():
-                if name in targets:
-                    targets.remove(name)
+            for t in store.assignments.pop(name, ()):
+                store.target_to_senders.get(t, set()).discard(name)
+            # Remove them from the target lists of the senders reinforcing them
+            for sender in store.target_to_senders.pop(name, ()):
+                store.assignments[sender] = [t for t in store.assignments[sender] if t != name]
+            bump_roster_version()
 
 def reset_event():
-    with store.lock:
-        store.members.clear()
+    with store.members_lock, store.assignments_lock, store.config_lock:
+        store.names.clear()
+        store.idx.clear()
+        store.coord_str.clear()
+        store.all_online = True
+        store.online_overrides.clear()
         store.assignments.clear()
+        store.target_to_senders.clear()
         store.batch_id = None
         store.locked = False
+        bump_roster_version()
 
 # ---------------------------
 # UI
@@ -359,7 +531,6 @@ with st.expander("📋 How to Use This App", expanded=False):
     """)
 
 # Auto-refresh to keep everyone in sync
-st.sidebar.write(f"⏱ Last refresh: {datetime.now().strftime('%H:%M:%S')}")
 st.sidebar.write(f"🔁 Auto-refresh every {REFRESH_SECONDS}s")
 st.sidebar.button("Refresh now")
 st.sidebar.markdown("---")
@@ -427,7 +598,7 @@ with st.form("me_form", clear_on_submit=True):
 
 if submitted:
     # Check if board is locked
-    with store.lock:
+    with store.config_lock:
         current_locked = store.locked
     
     if current_locked:
@@ -469,92 +640,88 @@ if submitted:
                 # All validation passed, register the member
                 x_coord = int(my_x)
                 y_coord = int(my_y)
-                upsert_member(my_name.strip(), my_power, int(my_slots), True, x_coord, y_coord)
+                upsert_member(my_name, my_power, int(my_slots), True, x_coord, y_coord)
                 st.success("✅ **Registration Successful!** You're now registered for the Crazy Joe event.")
             except ValueError as e:
                 st.error(f"❌ **Registration failed:** {str(e)}")
 
-df = members_df()
+# Live panel: re-runs on its own every REFRESH_SECONDS without rerunning the whole script
+@st.fragment(run_every=REFRESH_SECONDS)
+def live_panel():
+    # Only the admin list shows rows in our order; viewers get a sortable table
+    df = members_df(sort=authed)
+    online_df = online_members(df)
+    registered_count = len(online_df)
 
-# Check if board is locked for event status
-with store.lock:
-    current_locked = store.locked
+    # Check if board is locked for event status
+    with store.config_lock:
+        current_locked = store.locked
 
-if current_locked:
-    st.markdown("""
-    <div style="background-color: #ff4444; color: white; padding: 10px; border-radius: 5px; text-align: center; margin-bottom: 10px;">
-        <h3 style="margin: 0; color: white;">🚀 EVENT STARTED</h3>
-        <p style="margin: 5px 0 0 0; font-size: 14px; color: #ffcccc;">Board locked - assignments are final</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-st.subheader("🎯 Reinforcement Assignments")
-# Recalc button
-can_recalc = not current_locked
-if st.button("Recalculate assignments", type="primary", disabled=not can_recalc):
-    online_df = df[df["online"]].copy()
-    assign_map = compute_assignments(online_df)
-    save_assignments(assign_map)
-    st.success(f"Assignments recalculated (batch {store.batch_id} UTC).")
-
-# Show saved assignments, or a live preview if none saved yet
-saved = assignments_df()
-if saved.empty:
-    preview = df[df["online"]].copy()
-    if not preview.empty:
-        pre_map = compute_assignments(preview)
-        # Get member coordinates for preview
-        member_coords = {}
-        for name, rec in store.members.items():
-            x = rec.get("x_coord", 0)
-            y = rec.get("y_coord", 0)
-            member_coords[name] = f"({x},{y})"
-        
-        pre_rows = []
-        for s, tgts in pre_map.items():
-            target_list = []
-            for t in tgts:
-                coords = member_coords.get(t, "(0,0)")
-                target_list.append(f"{t} {coords}")
-            pre_rows.append({"sender": s, "targets": ", ".join(target_list)})
+    if current_locked:
+        st.markdown("""
+        <div style="background-color: #ff4444; color: white; padding: 10px; border-radius: 5px; text-align: center; margin-bottom: 10px;">
+            <h3 style="margin: 0; color: white;">🚀 EVENT STARTED</h3>
+            <p style="margin: 5px 0 0 0; font-size: 14px; color: #ffcccc;">Board locked - assignments are final</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.subheader("🎯 Reinforcement Assignments")
+    # Lives in the fragment so it ticks with each auto-refresh (fragments can't write to the sidebar)
+    st.caption(f"⏱ Last refresh: {datetime.now().strftime('%H:%M:%S')}")
+    # Recalc button
+    can_recalc = not current_locked
+    if st.button("Recalculate assignments", type="primary", disabled=not can_recalc):
+        assign_map = compute_assignments(*_online_arrays())
+        save_assignments(assign_map)
+        st.success(f"Assignments recalculated (batch {store.batch_id} UTC).")
+
+    # Show saved assignments, or a live preview if none saved yet
+    saved = assignments_df()
+    if saved.empty:
+        if not online_df.empty:
+            # Served from the cache until the roster or mode changes, locked or not
+            pre_map = compute_assignments(*_online_arrays())
+            # Get member coordinates for preview
+            with store.members_lock:
+                member_coords = dict(zip(store.names, store.coord_str))
         
-        st.info("No saved batch yet. Showing live preview (not locked).")
-        st.dataframe(pd.DataFrame(pre_rows).sort_values("sender").reset_index(drop=True),
-                     use_container_width=True)
+            st.info("No saved batch yet. Showing live preview (not locked).")
+            st.dataframe(format_assignments(pre_map, member_coords), use_container_width=True)
+        else:
+            st.write("—")
     else:
-        st.write("—")
-else:
-    if store.batch_id:
-        st.caption(f"Batch: **{store.batch_id} UTC**")
-    st.dataframe(saved, use_container_width=True)
-
-st.divider()
-
-# Event Participants (moved to bottom for mobile)
-st.subheader("👥 Event Participants")
-registered_count = len(df[df["online"]])
-total_count = len(df)
-st.metric("Registered Members", f"{registered_count}/{total_count}")
-
-if registered_count > 0:
-    # Show participants with remove buttons for admins
-    if authed:
-        st.info("🔧 **Admin Mode**: You can remove individual players below")
-        for idx, row in df[df["online"]].iterrows():
-            col1, col2, col3 = st.columns([3, 1, 0.5])
-            with col1:
-                st.write(f"**{row['name']}** - Power: {row['power']}M - Slots: {row['slots_to_send']} - Location: ({row['x_coord']},{row['y_coord']})")
-            with col2:
-                if st.button("❌ Remove", key=f"remove_{row['name']}", type="secondary"):
-                    remove_member(row['name'])
-                    st.success(f"Removed {row['name']} from the event")
-                    st.rerun()
-            with col3:
-                st.write("")  # Spacer
+        if store.batch_id:
+            st.caption(f"Batch: **{store.batch_id} UTC**")
+        st.dataframe(saved, use_container_width=True)
+
+    st.divider()
+
+    # Event Participants (moved to bottom for mobile)
+    st.subheader("👥 Event Participants")
+    total_count = len(df)
+    st.metric("Registered Members", f"{registered_count}/{total_count}")
+
+    if registered_count > 0:
+        # Show participants with remove buttons for admins
+        if authed:
+            st.info("🔧 **Admin Mode**: You can remove individual players below")
+            for row in online_df.itertuples(index=False):
+                col1, col2, col3 = st.columns([3, 1, 0.5])
+                with col1:
+                    st.write(f"**{row.name}** - Power: {row.power}M - Slots: {row.slots_to_send} - Location: ({row.x_coord},{row.y_coord})")
+                with col2:
+                    if st.button("❌ Remove", key=f"remove_{row.name}", type="secondary"):
+                        remove_member(row.name)
+                        st.success(f"Removed {row.name} from the event")
+                        st.rerun()
+                with col3:
+                    st.write("")  # Spacer
+        else:
+            st.dataframe(online_df, use_container_width=True)
     else:
-        st.dataframe(df[df["online"]].reset_index(drop=True), use_container_width=True)
-else:
-    st.info("No members registered yet. Be the first to join the event!")
+        st.info("No members registered yet. Be the first to join the event!")
+
+live_panel()
 
 st.divider()
 
@@ -568,7 +735,7 @@ with st.expander("🔧 Admin Tools", expanded=False):
         st.success("✅ Admin access granted!")
         
         # Assignment mode selector
-        with store.lock:
+        with store.config_lock:
             current_mode = getattr(store, 'assignment_mode', 'balanced')
         mode_options = {
             "Balanced Distribution": "balanced",
@@ -583,12 +750,13 @@ with st.expander("🔧 Admin Tools", expanded=False):
         )
         new_mode = mode_options[selected_mode]
         if new_mode != current_mode and authed:
-            with store.lock:
+            with store.config_lock:
                 store.assignment_mode = new_mode
+                bump_version()
             st.success(f"✅ Assignment mode changed to: {selected_mode}")
         
         # Lock board toggle
-        with store.lock:
+        with store.config_lock:
             current_locked = store.locked
         new_locked = st.toggle(
             "🔒 Lock Board", 
@@ -597,7 +765,7 @@ with st.expander("🔧 Admin Tools", expanded=False):
             help="When locked, assignments won't change until unlocked. Use during events to prevent changes."
         )
         if new_locked != current_locked and authed:
-            with store.lock:
+            with store.config_lock:
                 store.locked = new_locked
         if new_locked:
             st.warning("🔒 Board is now LOCKED - assignments won't change")
@@ -618,8 +786,3 @@ with st.expander("🔧 Admin Tools", expanded=False):
         
 
 st.caption("Note: This version stores everything in memory only. If the app restarts, data resets. Export before you reset/end the event.")
-# Simple auto-refresh
-st.markdown(
-    f"<script>setTimeout(() => window.location.reload(), {REFRESH_SECONDS*1000});</script>",
-    unsafe_allow_html=True
-)